@@ -1,9 +1,19 @@
 from prefect_aws.s3 import S3Bucket
-import json
+from prefect_aws.credentials import MinIOCredentials
+from aiobotocore.session import AioSession
+from botocore.exceptions import ClientError
+import orjson
 import tempfile
 import os
+import io
+import gzip
 import asyncio
 
+# Minimum size of every multipart upload part except the last (S3 limit)
+MULTIPART_CHUNK_SIZE = 5 * 1024 * 1024
+# Maximum number of concurrent file uploads
+MAX_CONCURRENT_UPLOADS = 16
+
 class S3IOManager:
     """
     S3IOManager encapsulates logic for handling I/O operations with scraped data and S3.
@@ -20,13 +30,67 @@ class S3IOManager:
         self.s3_bucket = S3Bucket.load(bucket_name)
         # Create a temporary directory for storing intermediate JSON files
         self.temp_dir = tempfile.TemporaryDirectory()
+        # S3 client and upload semaphore shared by a batch of file uploads
+        self._client = None
+        self._sem = None
+
+    def __enter__(self) -> 'S3IOManager':
+        """
+        Enters the IO manager context.
+
+        Returns:
+            S3IOManager: The IO manager itself.
+        """
+        return self
 
-    def __del__(self):
+    def __exit__(self, exc_type, exc, tb) -> None:
         """
-        Destructor to clean up the temporary directory.
+        Cleans up the temporary directory and releases any S3 client reference.
         """
-        if self.temp_dir:
-            self.temp_dir.cleanup()
+        self._client = None
+        self._sem = None
+        self.temp_dir.cleanup()
+
+    def _object_key(self, key: str) -> str:
+        """
+        Resolves a key relative to the bucket folder configured on the Prefect block.
+
+        Args:
+            key (str): Key relative to the bucket folder.
+
+        Returns:
+            str: Full key within the bucket.
+        """
+        folder = self.s3_bucket.bucket_folder
+        return f"{folder.rstrip('/')}/{key}" if folder else key
+
+    def _create_client(self):
+        """
+        Creates an aiobotocore S3 client context from the Prefect block credentials, honouring
+        the block's profile and client parameters (endpoint URL, TLS verification, botocore config)
+        so that it talks to the same endpoint as the block itself.
+
+        Returns:
+            ClientCreatorContext: Async context manager yielding the S3 client.
+        """
+        credentials = self.s3_bucket.credentials
+        if isinstance(credentials, MinIOCredentials):
+            session = AioSession()
+            client_kwargs = {
+                'aws_access_key_id': credentials.minio_root_user,
+                'aws_secret_access_key': credentials.minio_root_password.get_secret_value(),
+            }
+        else:
+            session = AioSession(profile=credentials.profile_name)
+            secret = credentials.aws_secret_access_key
+            client_kwargs = {
+                'aws_access_key_id': credentials.aws_access_key_id,
+                'aws_secret_access_key': secret.get_secret_value() if secret else None,
+                'aws_session_token': credentials.aws_session_token,
+            }
+        client_kwargs['region_name'] = credentials.region_name
+        client_kwargs.update(credentials.aws_client_parameters.get_params_override())
+        return session.create_client('s3', **client_kwargs)
 
     def list_bucket_contents(self) -> list:
         """
@@ -37,6 +101,48 @@ class S3IOManager:
         """
         return self.s3_bucket.list_objects()
 
+    def read_object(self, key: str) -> bytes:
+        """
+        Reads the raw contents of an object in the S3 bucket.
+
+        Args:
+            key (str): Key of the object within the bucket.
+
+        Returns:
+            bytes: Contents of the object.
+        """
+        return self.s3_bucket.read_path(key)
+
+    def read_object_if_exists(self, key: str) -> bytes:
+        """
+        Reads the raw contents of an object in the S3 bucket, if it exists.
+
+        Args:
+            key (str): Key of the object within the bucket.
+
+        Returns:
+            bytes: Contents of the object, or None if no object exists under the key.
+
+        Raises:
+            ClientError: For any S3 error other than a missing key.
+        """
+        try:
+            return self.read_object(key)
+        except ClientError as err:
+            if err.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey'):
+                return None
+            raise
+
+    def write_object(self, key: str, data: bytes) -> None:
+        """
+        Writes raw bytes to an object in the S3 bucket.
+
+        Args:
+            key (str): Key of the object within the bucket.
+            data (bytes): Contents to write.
+        """
+        self.s3_bucket.write_path(key, data)
+
     def save_data_to_json(self, data: dict, filename: str, directory: str = None) -> None:
         """
         Saves the given data to a JSON file in a temporary directory or a specified directory.
@@ -53,28 +159,85 @@ class S3IOManager:
         # Determine the path to save the file
         save_path = os.path.join(directory if directory else self.temp_dir.name, filename)
 
-        # Write the data to a JSON file
-        with open(save_path, 'w') as file:
-            json.dump(data, file)
+        # Write the serialized data to a JSON file
+        with open(save_path, 'wb') as file:
+            file.write(orjson.dumps(data))
+
+    async def stream_ndjson_gz(self, key: str, records) -> None:
+        """
+        Streams records to S3 as gzip-compressed newline-delimited JSON using a multipart upload,
+        without writing an intermediate file to disk.
+
+        Args:
+            key (str): Key of the object to create within the bucket folder.
+            records (iterable): JSON-serializable records, one per output line.
+        """
+        bucket = self.s3_bucket.bucket_name
+        key = self._object_key(key)
+        async with self._create_client() as client:
+            upload = await client.create_multipart_upload(Bucket=bucket, Key=key, ContentType='application/x-ndjson')
+            upload_id = upload['UploadId']
+            parts = []
+            buffer = io.BytesIO()
+
+            async def upload_part() -> None:
+                # Upload the compressed bytes buffered so far as the next part, then rotate the buffer
+                part_number = len(parts) + 1
+                response = await client.upload_part(Bucket=bucket, Key=key, UploadId=upload_id,
+                                                    PartNumber=part_number, Body=buffer.getvalue())
+                parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+                buffer.seek(0)
+                buffer.truncate()
+
+            try:
+                with gzip.GzipFile(fileobj=buffer, mode='wb') as gz:
+                    for record in records:
+                        gz.write(orjson.dumps(record) + b'\n')
+                        if buffer.tell() >= MULTIPART_CHUNK_SIZE:
+                            await upload_part()
+                # Upload the remaining bytes, including the gzip trailer written on close
+                await upload_part()
+                await client.complete_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id,
+                                                       MultipartUpload={'Parts': parts})
+            except Exception:
+                await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+                raise
 
     async def upload_file_to_s3(self, filepath: str) -> None:
         """
-        Uploads a single file to the S3 bucket.
+        Uploads a single file to the S3 bucket, bounded by the shared upload semaphore.
 
         Args:
             filepath (str): Path to the file to upload.
         """
-        await self.s3_bucket.upload_from_path(filepath)
+        # Open the shared client when called outside of a batch upload
+        if self._client is None:
+            await self.upload_files_to_s3([filepath])
+            return
+        async with self._sem:
+            with open(filepath, 'rb') as file:
+                body = file.read()
+            await self._client.put_object(Bucket=self.s3_bucket.bucket_name,
+                                          Key=self._object_key(os.path.basename(filepath)), Body=body)
 
     async def upload_files_to_s3(self, filepaths: list) -> None:
         """
-        Asynchronously uploads multiple files to the S3 bucket.
+        Asynchronously uploads multiple files to the S3 bucket over a single S3 client,
+        with at most MAX_CONCURRENT_UPLOADS uploads in flight.
 
         Args:
             filepaths (list): List of file paths to upload.
         """
-        tasks = [self.upload_file_to_s3(filepath) for filepath in filepaths]
-        await asyncio.gather(*tasks)
+        async with self._create_client() as client:
+            self._client = client
+            # Created per batch since a semaphore is bound to the running event loop
+            self._sem = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+            try:
+                tasks = [self.upload_file_to_s3(filepath) for filepath in filepaths]
+                await asyncio.gather(*tasks)
+            finally:
+                self._client = None
+                self._sem = None
 
     def upload_directory_to_s3(self, directory: str = None) -> None:
         """
@@ -94,8 +257,8 @@ class S3IOManager:
 
 if __name__ == '__main__':
     # Example usage
-    # s3_manager = S3IOManager('my_s3_bucket_block')
-    # data = {'key1': 'value1', 'key2': 'value2'}
-    # s3_manager.save_data_to_json(data, 'example')
-    # s3_manager.upload_directory_to_s3()
+    # with S3IOManager('my_s3_bucket_block') as s3_manager:
+    #     data = {'key1': 'value1', 'key2': 'value2'}
+    #     s3_manager.save_data_to_json(data, 'example')
+    #     s3_manager.upload_directory_to_s3()
     pass
@@ -0,0 +1,66 @@
+from pybloom_live import ScalableBloomFilter
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Key of the persisted filter within the S3 bucket
+SEEN_URLS_KEY = 'state/seen_urls.bloom'
+
+class SeenURLFilter:
+    """
+    SeenURLFilter tracks article URLs that were already scraped in previous runs
+    using a scalable Bloom filter, so they can be skipped before any request is made.
+    """
+
+    def __init__(self, bloom: ScalableBloomFilter = None) -> None:
+        """
+        Initializes the filter, starting empty if no Bloom filter is given.
+
+        Args:
+            bloom (ScalableBloomFilter, optional): Existing Bloom filter. Defaults to None.
+        """
+        self._bloom = bloom if bloom is not None else ScalableBloomFilter(initial_capacity=100_000, error_rate=1e-4)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._bloom
+
+    def add(self, url: str) -> None:
+        """
+        Marks a URL as seen.
+
+        Args:
+            url (str): URL that was scraped.
+        """
+        self._bloom.add(url)
+
+    @classmethod
+    def load(cls, io_manager, key: str = SEEN_URLS_KEY) -> 'SeenURLFilter':
+        """
+        Loads the filter persisted in S3, or starts an empty one if none exists yet.
+        Any other read error is raised, so a persisted filter is never overwritten by an empty one.
+
+        Args:
+            io_manager (S3IOManager): IO manager of the bucket holding the filter.
+            key (str, optional): Key of the persisted filter. Defaults to SEEN_URLS_KEY.
+
+        Returns:
+            SeenURLFilter: Loaded filter.
+        """
+        data = io_manager.read_object_if_exists(key)
+        if data is None:
+            logger.info(f"No seen URL filter found at {key}, starting empty")
+            return cls()
+        return cls(ScalableBloomFilter.fromfile(io.BytesIO(data)))
+
+    def save(self, io_manager, key: str = SEEN_URLS_KEY) -> None:
+        """
+        Persists the filter to S3.
+
+        Args:
+            io_manager (S3IOManager): IO manager of the bucket holding the filter.
+            key (str, optional): Key of the persisted filter. Defaults to SEEN_URLS_KEY.
+        """
+        buffer = io.BytesIO()
+        self._bloom.tofile(buffer)
+        io_manager.write_object(key, buffer.getvalue())
@@ -10,7 +10,12 @@
 # time.sleep(5) # Let the user actually see something!
 # driver.quit()
 
-from webscraper import AsyncWebScraper
+import config
+# Stub the block list when the local config does not define one, since webscrape_flow reads it at import
+if not hasattr(config, 'yahoo_fin_block_set'):
+    config.yahoo_fin_block_set = {'https://www.marketwatch.com/story/article3'}
+
+from webscraper import AsyncWebScraper, _extract_text_static
 from webscrape_flow import yahoo_url_filter, extract_urls_to_news, webscrape_extract
 from unittest.mock import patch
 
@@ -23,6 +28,32 @@ def test_url_filter():
     filtered_urls = yahoo_url_filter(urls)
     assert len(filtered_urls) == 2  # Expect only Yahoo Finance URLs
 
+# Test that relative links are completed while absolute http/https links are kept as is
+def test_yahoo_url_filter_completes_relative_urls():
+    urls = ['/news/article4',
+            'http://finance.yahoo.com/news/article5',
+            'https://finance.yahoo.com/news/article6']
+
+    filtered_urls = yahoo_url_filter(urls)
+    assert filtered_urls == ['https://finance.yahoo.com/news/article4',
+                             'http://finance.yahoo.com/news/article5',
+                             'https://finance.yahoo.com/news/article6']
+
+# Test that a relative link with '://' in its query string is still prefixed
+def test_yahoo_url_filter_prefixes_relative_url_with_scheme_in_query():
+    urls = ['/news/article7?redirect=https://example.com']
+
+    filtered_urls = yahoo_url_filter(urls)
+    assert filtered_urls == ['https://finance.yahoo.com/news/article7?redirect=https://example.com']
+
+# Test text and title extraction from raw article HTML
+def test_extract_text():
+    html = ('<html><head><title>Markets Rally</title><script>var x = 1;</script></head>'
+            '<body><p>Stocks rose\xa0sharply.</p><p> Bonds fell. </p></body></html>').encode('utf-8')
+    text, title = _extract_text_static(html)
+    assert title == 'Markets Rally'
+    assert text == 'Stocks rose sharply. Bonds fell.'
+
 # Test the extract_urls_to_news flow with a mock for fetch_all_links
 @patch('webscraper.AsyncWebScraper.fetch_all_links')
 def test_extract_urls_to_news(mock_fetch):
@@ -36,6 +67,18 @@ if __name__ == '__main__':
     test_url_filter()
     print("test_url_filter passed.")
 
+    print("Running test_yahoo_url_filter_completes_relative_urls...")
+    test_yahoo_url_filter_completes_relative_urls()
+    print("test_yahoo_url_filter_completes_relative_urls passed.")
+
+    print("Running test_yahoo_url_filter_prefixes_relative_url_with_scheme_in_query...")
+    test_yahoo_url_filter_prefixes_relative_url_with_scheme_in_query()
+    print("test_yahoo_url_filter_prefixes_relative_url_with_scheme_in_query passed.")
+
+    print("Running test_extract_text...")
+    test_extract_text()
+    print("test_extract_text passed.")
+
     print("Running test_extract_urls_to_news...")
     test_extract_urls_to_news()
     print("test_extract_urls_to_news passed.")
@@ -1,39 +1,28 @@
 # Importing libraries
 import sys
 import os
-from prefect import flow, task
+from prefect import flow
 from webscraper import AsyncWebScraper
 import config
 import asyncio
 import logging
-from prefect_dask import DaskTaskRunner, get_dask_client
-import dask 
-import dask.distributed
 from s3_io_manager import S3IOManager
+from seen_filter import SeenURLFilter
 
 import datetime 
 
-# Initialize Dask client for parallelization of flows
-client = dask.distributed.Client()
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def url_filter(url: str, block_set: set) -> bool:
-    """
-    Filter function to remove unwanted URLs from results.
-
-    Args:
-        url (str): URL string
-        block_set (set): Set of unwanted URL strings
+# Yahoo Finance block list frozen once at import for hashed membership tests
+_YAHOO_BLOCK = frozenset(config.yahoo_fin_block_set)
+# Domain prepended to relative Yahoo Finance links
+_YAHOO_PREFIX = 'https://finance.yahoo.com'
+# Prefix of MarketWatch article links
+_MARKETWATCH_PREFIX = 'https://www.marketwatch.com/story'
 
-    Returns:
-        bool: True if URL is acceptable, False otherwise
-    """
-    return url not in block_set
-
-def extract_news_text(scraper: AsyncWebScraper, website: str) -> dict:
+async def extract_news_text(scraper: AsyncWebScraper, website: str) -> dict:
     """
     Extract raw text data from news links from a defined website.
 
@@ -44,13 +33,15 @@ def extract_news_text(scraper: AsyncWebScraper, website: str) -> dict:
     Returns:
         dict: Dictionary mapping URLs to their text content and titles
     """
-    # Perform async requests of news articles, returns tuples of (raw HTML data, URL source)
-    link_to_data = scraper.scrape_and_get_html(scraper.collected_links[website])
+    # Perform async requests of news articles over the scraper's shared session
+    link_to_data = await scraper.scrape_html(scraper.collected_links[website])
     return link_to_data
 
 def yahoo_url_filter(urls: list) -> list:
     """
     Perform URL filtering and data validation for Yahoo Finance News.
+    Links not starting with an http(s) scheme are treated as relative and prefixed with the
+    Yahoo Finance domain.
 
     Args:
         urls (list): List of URLs
@@ -58,13 +49,9 @@ def yahoo_url_filter(urls: list) -> list:
     Returns:
         list: Formatted and cleaned list of URLs to request data from
     """
-    # Filter unwanted links
-    filtered_urls = list(filter(lambda url: url_filter(url, config.yahoo_fin_block_set), urls))
-    # Perform data validation on URLs to ensure they are complete URLs
-    for i in range(len(filtered_urls)):
-        if not filtered_urls[i].startswith('https'):
-            filtered_urls[i] = 'https://finance.yahoo.com' + filtered_urls[i]
-    return filtered_urls
+    # Filter unwanted links and complete relative URLs in a single pass
+    return [url if url.startswith(('http://', 'https://')) else _YAHOO_PREFIX + url
+            for url in urls if url not in _YAHOO_BLOCK]
 
 def marketwatch_url_filter(urls: list) -> list:
     """
@@ -77,47 +64,50 @@ def marketwatch_url_filter(urls: list) -> list:
         list: Formatted and cleaned list of URLs to request data from
     """
     # Filter unwanted links
-    filtered_urls = list(filter(lambda url: url.startswith('https://www.marketwatch.com/story'), urls))
-    return filtered_urls
+    return [url for url in urls if url.startswith(_MARKETWATCH_PREFIX)]
 
-@task 
-def extract_yahoo_finance_news(scraper: AsyncWebScraper, website: str) -> dict:
+async def extract_yahoo_finance_news(scraper: AsyncWebScraper, website: str, seen_urls: SeenURLFilter) -> dict:
     """
-    Extract Yahoo Finance News.
+    Extract Yahoo Finance News, starting article requests as soon as its top-level links are collected.
 
     Args:
-        scraper (AsyncWebScraper): Scraper object containing the URLs to be scraped
+        scraper (AsyncWebScraper): Scraper object used to collect links and scrape them
         website (str): Top-level website string
+        seen_urls (SeenURLFilter): Filter of article URLs scraped in previous runs
 
     Returns:
         dict: Dictionary mapping URLs to their text content and titles
     """
+    # Retrieve all links from the top-level website
+    await scraper.fetch_links(website)
     # Perform filter of unwanted links and append domain if needed
-    filtered_urls = yahoo_url_filter(scraper.collected_links[website])
-    # Update Yahoo Finance key
-    scraper.collected_links[website] = filtered_urls
+    filtered_urls = yahoo_url_filter(scraper.collected_links.get(website, []))
+    # Update Yahoo Finance key, skipping articles scraped in previous runs
+    scraper.collected_links[website] = [url for url in filtered_urls if url not in seen_urls]
     # Extract data
-    link_to_data = extract_news_text(scraper, website)
+    link_to_data = await extract_news_text(scraper, website)
     return link_to_data
 
-@task 
-def extract_marketwatch_news(scraper: AsyncWebScraper, website: str) -> dict:
+async def extract_marketwatch_news(scraper: AsyncWebScraper, website: str, seen_urls: SeenURLFilter) -> dict:
     """
-    Extract MarketWatch News.
+    Extract MarketWatch News, starting article requests as soon as its top-level links are collected.
 
     Args:
-        scraper (AsyncWebScraper): Scraper object containing the URLs to be scraped
+        scraper (AsyncWebScraper): Scraper object used to collect links and scrape them
         website (str): Top-level website string
+        seen_urls (SeenURLFilter): Filter of article URLs scraped in previous runs
 
     Returns:
         dict: Dictionary mapping URLs to their text content and titles
     """
+    # Retrieve all links from the top-level website
+    await scraper.fetch_links(website)
     # Perform filter of unwanted links and append domain if needed
-    filtered_urls = marketwatch_url_filter(scraper.collected_links[website])
-    # Update MarketWatch key
-    scraper.collected_links[website] = filtered_urls
+    filtered_urls = marketwatch_url_filter(scraper.collected_links.get(website, []))
+    # Update MarketWatch key, skipping articles scraped in previous runs
+    scraper.collected_links[website] = [url for url in filtered_urls if url not in seen_urls]
     # Extract data
-    link_to_data = extract_news_text(scraper, website)
+    link_to_data = await extract_news_text(scraper, website)
     return link_to_data
 
 @flow 
@@ -138,33 +128,47 @@ def extract_urls_to_news(urls: list) -> AsyncWebScraper:
     # Return the scraper object
     return scraper
 
-@flow(task_runner=DaskTaskRunner(address=client.scheduler.address))
-def extract_news(scraper: AsyncWebScraper, websites: list) -> list:
+async def _extract_all_news(scraper: AsyncWebScraper, websites: list, seen_urls: SeenURLFilter) -> tuple:
     """
-    Extract text information from news links existing on the top-level websites given.
+    Concurrently extract news from all top-level websites within a single scraper session.
+    Each website's pipeline runs independently, so article fetches of one website overlap
+    with link collection of the other.
 
     Args:
         scraper (AsyncWebScraper): Scraper object that contains async methods and URL info
         websites (list): List of top-level websites to scrape
+        seen_urls (SeenURLFilter): Filter of article URLs scraped in previous runs
+
+    Returns:
+        tuple: Yahoo Finance data and MarketWatch data
+    """
+    async with scraper:
+        return await asyncio.gather(
+            extract_yahoo_finance_news(scraper, websites[0], seen_urls),
+            extract_marketwatch_news(scraper, websites[1], seen_urls),
+        )
+
+@flow(persist_result=False, log_prints=False)
+def extract_news(scraper: AsyncWebScraper, websites: list, seen_urls: SeenURLFilter) -> list:
+    """
+    Collect news links from the top-level websites given and extract their text information.
+    Articles are fetched with asyncio inside this single flow run rather than as individual
+    Prefect tasks, so orchestration overhead stays constant regardless of the article count.
+
+    Args:
+        scraper (AsyncWebScraper): Scraper object that contains async methods and URL info
+        websites (list): List of top-level websites to scrape
+        seen_urls (SeenURLFilter): Filter of article URLs scraped in previous runs
 
     Returns:
         list: List of tuples containing (text data, title, URL source)
     """
-    # PrefectFuture Object
-    future_yahoo = extract_yahoo_finance_news.submit(scraper, websites[0])
-    future_marketwatch = extract_marketwatch_news.submit(scraper, websites[1])
-    
-    # Return Dask client 
-    with get_dask_client():
-        # Upload web scraper implementation to Dask workers
-        client.upload_file('/opt/REAL-TIME-STOCK-MARKET-Sentiment-Analysis-ETL-Pipeline/data_extraction/webscraper.py')
-        # Retrieve data 
-        yahoo_data = future_yahoo.result()
-        marketwatch_data = future_marketwatch.result()
-    
+    # Run both websites' extraction in one event loop
+    yahoo_data, marketwatch_data = asyncio.run(_extract_all_news(scraper, websites, seen_urls))
+
     return [('finance_yahoo_news', yahoo_data), ('marketwatch_latest_news', marketwatch_data)]
 
-@flow 
+@flow(persist_result=False, log_prints=False)
 def push_to_s3(bucket_block: str, data: list) -> None:
     """
     Push data to S3 Bucket.
@@ -173,17 +177,14 @@ def push_to_s3(bucket_block: str, data: list) -> None:
         bucket_block (str): S3 bucket block identifier
         data (list): List of tuples (website name, dict of data)
     """
-    # Define IO object 
-    i_o = S3IOManager(bucket_block)
     # Define timestamp for file name 
     t_stamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-    # Write data to JSON in temp dir 
-    for website, d in data:
-        i_o.write_to_json(d, f'{t_stamp}_{website}')
-    # Push data to S3 bucket 
-    i_o.pushObject_to_S3()
-    # Clean up IO object 
-    del i_o
+    # Define IO object, cleaned up on exit
+    with S3IOManager(bucket_block) as i_o:
+        # Stream each website's data to the S3 bucket as gzip-compressed NDJSON
+        for website, d in data:
+            records = ({'url': url, 'text': text, 'title': title} for url, (text, title) in d.items())
+            asyncio.run(i_o.stream_ndjson_gz(f'{t_stamp}_{website}.ndjson.gz', records))
     return 
 
 @flow
@@ -193,12 +194,20 @@ def webscrape_extract() -> None:
     """
     # Define list of finance websites to scrape 
     websites = config.top_level_websites
-    # Kickoff extract_urls_to_news links flow
-    scraper = extract_urls_to_news(websites)
-    # Extract text data from the defined websites 
-    website_datalist = extract_news(scraper, websites)
-    # Push data into cloud storage 
-    push_to_s3(config.s3_block, website_datalist)
+    with S3IOManager(config.s3_block) as i_o:
+        # Load the filter of article URLs scraped in previous runs
+        seen_urls = SeenURLFilter.load(i_o)
+        # Define scraper object with the list of websites
+        scraper = AsyncWebScraper(websites)
+        # Collect links and extract text data from the defined websites
+        website_datalist = extract_news(scraper, websites, seen_urls)
+        # Mark articles answered with 200 OK as seen
+        for url in scraper.fetched_urls:
+            seen_urls.add(url)
+        # Push data into cloud storage 
+        push_to_s3(config.s3_block, website_datalist)
+        # Persist the filter once the data is stored
+        seen_urls.save(i_o)
     return 
 
 
@@ -216,7 +225,6 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"An error occurred: {e}")
     finally:
-        client.close()
         shutdown_logging()
         logger.info("Shutting down gracefully.")
 
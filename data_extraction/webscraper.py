@@ -1,67 +1,181 @@
 # Importing libraries
 import time
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+import os
+import multiprocessing
 import asyncio
 import aiohttp
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import lxml.etree
+import lxml.html
 import async_timeout
-from functools import reduce
+import uvloop
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Run every asyncio event loop in the process on libuv
+asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+# Browser User-Agent sent with every request, since news sites answer default client agents with error pages
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+# Parsing constants built once at import and reused for every parsed article
+_STRIP_TAGS = ('script', 'style', 'template')
+_TITLE_XP = lxml.etree.XPath('string(//title)')
+_P_XP = lxml.etree.XPath('//p')
+# Parser decoding raw response bytes as UTF-8, the encoding served by the news sources
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+@lru_cache(maxsize=None)
+def _driver_path() -> str:
+    """
+    Installs the ChromeDriver matching the local Chrome once per process.
+
+    Returns:
+        str: Path to the ChromeDriver executable.
+    """
+    return ChromeDriverManager().install()
+
+def _extract_text_static(html: bytes) -> tuple:
+    """
+    Extracts the main text content and title from HTML.
+    Defined at module level so it can be pickled and run in worker processes.
+
+    Args:
+        html (bytes): The raw HTML content, as bytes or str.
+
+    Returns:
+        tuple: A tuple containing the extracted text and title.
+    """
+    try:
+        tree = lxml.html.fromstring(html, parser=_HTML_PARSER)
+    # ValueError is raised for str input carrying an XML encoding declaration
+    except (lxml.etree.ParserError, ValueError):
+        return '', "No Title Found"
+    lxml.etree.strip_elements(tree, *_STRIP_TAGS, with_tail=False)
+    title = _TITLE_XP(tree) or "No Title Found"
+    text = ' '.join(p.text_content().replace(u'\xa0', u' ').strip() for p in _P_XP(tree))
+    return text, title
+
 class AsyncWebScraper:
     """
     AsyncWebScraper encapsulates the logic for asynchronously scraping
     multiple web pages and extracting links or HTML content.
     """
 
-    def __init__(self, urls: list) -> None:
+    def __init__(self, urls: list, etags: dict = None) -> None:
         """
         Initializes the scraper with a list of URLs.
 
         Args:
             urls (list): List of URLs to scrape.
+            etags (dict, optional): Cache validators (ETag/Last-Modified) of previously fetched URLs. Defaults to None.
         """
         self.target_urls = urls
         self.collected_links = {}
+        # Article URLs answered with 200 OK by the most recent scrapes
+        self.fetched_urls = set()
+        self.etags = etags if etags is not None else {}
+        # Worker processes that parse article HTML off the event loop, started on first article fetch
+        self._pool = None
+        # Locks are created per context since asyncio locks bind to the running event loop
+        self._lock = None
+        self._session = None
+        # Headless browser started on first use and shared by all JS-rendered pages
+        self._browser = None
+        self._browser_lock = None
+
+    async def __aenter__(self) -> 'AsyncWebScraper':
+        """
+        Opens a pooled aiohttp session shared by every request made within the context.
+
+        Returns:
+            AsyncWebScraper: The scraper itself.
+        """
         self._lock = asyncio.Lock()
+        self._browser_lock = asyncio.Lock()
+        # aiodns resolves hostnames on the event loop instead of in the default thread pool
+        connector = aiohttp.TCPConnector(resolver=aiohttp.AsyncResolver(), limit=200, limit_per_host=16,
+                                         keepalive_timeout=30, ttl_dns_cache=600)
+        self._session = aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT})
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """
+        Closes the shared aiohttp session, and the parser pool and headless browser if they were started.
+        """
+        await self._session.close()
+        self._session = None
+        if self._pool:
+            self._pool.shutdown()
+            self._pool = None
+        if self._browser:
+            self._browser.quit()
+            self._browser = None
 
-    async def _fetch_links(self, url: str) -> None:
+    async def fetch_links(self, url: str) -> None:
         """
-        Uses Selenium with headless Chrome to fetch links from a webpage.
+        Fetches a webpage with aiohttp and extracts the links it contains.
+        Falls back to headless Chrome when the page is not answered with 200 OK or no links
+        are present in the static HTML, which indicates a blocked or JS-rendered page.
 
         Args:
             url (str): URL of the webpage to scrape.
         """
-        browser = None
         try:
-            options = Options()
-            options.add_argument('--no-sandbox')
-            options.add_argument('--headless')
-            options.add_argument('--disable-dev-shm-usage')
+            async with self._session.get(url) as response:
+                status = response.status
+                html = await response.read()
 
-            browser = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-            browser.get(url)
+            # Links of error and consent pages are not news links
+            links = []
+            if status == 200:
+                doc = lxml.html.fromstring(html, parser=_HTML_PARSER)
+                links = doc.xpath('//a/@href')
 
-            soup = BeautifulSoup(browser.page_source, 'lxml')
-            links = [link.get('href') for link in soup.find_all('a', href=True)]
+            if not links:
+                # Render in a worker thread so other pages keep fetching, one page at a time on the shared browser
+                async with self._browser_lock:
+                    links = await asyncio.to_thread(self._fetch_links_with_browser, url)
 
             async with self._lock:
                 self.collected_links[url] = links
 
         except Exception as err:
             print(f"Error while fetching links from {url}: {err}")
-        finally:
-            if browser:
-                browser.quit()
+
+    def _fetch_links_with_browser(self, url: str) -> list:
+        """
+        Uses Selenium with a shared headless Chrome to fetch links from a JS-rendered webpage.
+
+        Args:
+            url (str): URL of the webpage to scrape.
+
+        Returns:
+            list: List of links found on the rendered page.
+        """
+        if self._browser is None:
+            options = Options()
+            options.add_argument('--no-sandbox')
+            options.add_argument('--headless')
+            options.add_argument('--disable-dev-shm-usage')
+            options.add_argument(f'--user-agent={USER_AGENT}')
+            self._browser = webdriver.Chrome(service=Service(_driver_path()), options=options)
+
+        self._browser.get(url)
+        doc = lxml.html.fromstring(self._browser.page_source)
+        return doc.xpath('//a/@href')
 
     async def _gather_links(self) -> None:
         """
-        Gathers links from all target URLs asynchronously.
+        Gathers links from all target URLs asynchronously over a shared session.
         """
-        tasks = [self._fetch_links(url) for url in self.target_urls]
-        await asyncio.gather(*tasks)
+        async with self:
+            tasks = [self.fetch_links(url) for url in self.target_urls]
+            await asyncio.gather(*tasks)
 
     def fetch_all_links(self) -> None:
         """
@@ -69,57 +183,99 @@ class AsyncWebScraper:
         """
         asyncio.run(self._gather_links())
 
-    async def _fetch_html(self, session: aiohttp.ClientSession, url: str) -> tuple:
+    def _conditional_headers(self, url: str) -> dict:
         """
-        Asynchronously fetches the HTML content of a given URL.
+        Builds conditional request headers from the stored cache validators of a URL.
 
         Args:
-            session (aiohttp.ClientSession): Active aiohttp session.
-            url (str): URL to fetch HTML from.
+            url (str): URL to build headers for.
 
         Returns:
-            tuple: HTML content and the source URL, or an error message and the URL.
+            dict: If-None-Match/If-Modified-Since headers, empty if the URL was never fetched.
         """
-        try:
-            async with async_timeout.timeout(10):
-                async with session.get(url) as response:
-                    return await response.text(), url
-        except (asyncio.exceptions.TimeoutError, aiohttp.client_exceptions.InvalidURL,
-                aiohttp.client_exceptions.ServerDisconnectedError,
-                aiohttp.client_exceptions.ClientConnectorError, UnicodeDecodeError) as e:
-            return f"Error: {str(e)}", url
+        validators = self.etags.get(url, {})
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Returns the parser process pool, starting it on first use. Workers are spawned rather
+        than forked since the scraper runs in a process that already has threads.
+
+        Returns:
+            ProcessPoolExecutor: Pool parsing article HTML.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
 
-    async def _fetch_all_html(self, session: aiohttp.ClientSession, urls: list) -> list:
+    async def _fetch_html(self, url: str) -> tuple:
         """
-        Creates tasks to fetch HTML content from multiple URLs asynchronously.
+        Asynchronously fetches the HTML content of a given URL, sending stored cache validators
+        so unchanged articles are answered with 304 Not Modified. The HTML is parsed in the
+        process pool so the event loop keeps serving other fetches meanwhile.
 
         Args:
-            session (aiohttp.ClientSession): Active aiohttp session.
-            urls (list): List of URLs to fetch HTML from.
+            url (str): URL to fetch HTML from.
 
         Returns:
-            list: List of tuples containing HTML content and URL.
+            tuple: Extracted (text, title) and the source URL, or an error message and the URL.
+                   The extracted content is None if the article is unchanged since the stored validators.
+                   URLs answered with 200 OK are recorded in fetched_urls.
         """
-        tasks = [self._fetch_html(session, url) for url in urls]
-        return await asyncio.gather(*tasks)
+        try:
+            async with async_timeout.timeout(10):
+                async with self._session.get(url, headers=self._conditional_headers(url)) as response:
+                    if response.status == 304:
+                        return None, url
+                    status = response.status
+                    headers = response.headers
+                    # Raw bytes go straight to lxml, skipping aiohttp's charset detection and str decoding
+                    html = await response.read()
+        except (asyncio.exceptions.TimeoutError, aiohttp.client_exceptions.InvalidURL,
+                aiohttp.client_exceptions.ServerDisconnectedError,
+                aiohttp.client_exceptions.ClientConnectorError) as e:
+            return (f"Error: {str(e)}", "No Title Found"), url
+
+        # Parse after the connection is released, so the timeout only bounds the network I/O
+        article = await asyncio.get_running_loop().run_in_executor(self._get_pool(), _extract_text_static, html)
+        if status == 200:
+            self.fetched_urls.add(url)
+            etag = headers.get('ETag')
+            last_modified = headers.get('Last-Modified')
+            # Only responses carrying a validator can be revalidated later
+            if etag or last_modified:
+                self.etags[url] = {'etag': etag, 'last_modified': last_modified}
+        return article, url
 
     async def scrape_html(self, urls: list) -> dict:
         """
         Initiates asynchronous HTML scraping for the given URLs.
+        Must be awaited within the scraper's async context.
 
         Args:
             urls (list): List of URLs to scrape.
 
         Returns:
             dict: A dictionary mapping each URL to its HTML content or an error message.
+                  Articles answered with 304 Not Modified are omitted.
         """
-        async with aiohttp.ClientSession() as session:
-            html_data = await self._fetch_all_html(session, urls)
-            return {url: self._extract_text(html) for html, url in html_data}
+        tasks = [self._fetch_html(url) for url in urls]
+        # Fill the result as each article completes instead of holding every fetch result until all finish
+        link_to_data = {}
+        for next_article in asyncio.as_completed(tasks):
+            article, url = await next_article
+            if article is not None:
+                link_to_data[url] = article
+        return link_to_data
 
-    def scrape_and_get_html(self, urls: list) -> dict:
+    async def _run_all(self, urls: list) -> dict:
         """
-        Wrapper method for scrape_html to run it synchronously.
+        Opens the shared session once and scrapes all given URLs within it.
 
         Args:
             urls (list): List of URLs to scrape.
@@ -127,24 +283,20 @@ class AsyncWebScraper:
         Returns:
             dict: A dictionary mapping each URL to its HTML content or an error message.
         """
-        return asyncio.run(self.scrape_html(urls))
+        async with self:
+            return await self.scrape_html(urls)
 
-    def _extract_text(self, html: str) -> tuple:
+    def scrape_and_get_html(self, urls: list) -> dict:
         """
-        Extracts the main text content and title from HTML.
+        Wrapper method for scrape_html to run it synchronously.
 
         Args:
-            html (str): The raw HTML content.
+            urls (list): List of URLs to scrape.
 
         Returns:
-            tuple: A tuple containing the extracted text and title.
-        """
-        soup = BeautifulSoup(html, 'lxml')
-        title = soup.title.get_text() if soup.title else "No Title Found"
-        for element in soup(['script', 'style', 'template', 'TemplateString', 'ProcessingInstruction', 'Declaration', 'Doctype']):
-            element.extract()
-        text = ' '.join([p.get_text().strip().replace(u'\xa0', u' ') for p in soup.find_all('p')])
-        return text, title
+            dict: A dictionary mapping each URL to its HTML content or an error message.
+        """
+        return asyncio.run(self._run_all(urls))
 
 if __name__ == '__main__':
     urls_to_scrape = ['https://finance.yahoo.com/news/', 'https://www.marketwatch.com/latest-news?mod=top_nav']